@@ -133,6 +133,16 @@ def main(args: List[str] | None = None):
         action="store_true",
         help="Remove document metadata",
     )
+    parser.add_argument(
+        "--linearize",
+        action="store_true",
+        help="Linearize output for fast web view (slower to save)",
+    )
+    parser.add_argument(
+        "--recompress-flate",
+        action="store_true",
+        help="Recompress Flate streams in aggressive mode (slow)",
+    )
 
     # Web server
     parser.add_argument(
@@ -279,6 +289,8 @@ def main(args: List[str] | None = None):
         remove_images=parsed_args.remove_images,
         aggressive=parsed_args.aggressive,
         strip_metadata=parsed_args.strip_metadata,
+        linearize=parsed_args.linearize,
+        recompress_flate=parsed_args.recompress_flate,
     )
 
     # Process files
@@ -16,6 +16,8 @@ class ReductionOptions:
     # Compression settings
     aggressive: bool = False
     strip_metadata: bool = False
+    linearize: bool = False
+    recompress_flate: bool = False  # Only applied in aggressive mode
 
     def __post_init__(self):
         """Validate options after initialization."""
@@ -34,6 +36,8 @@ class ReductionOptions:
             remove_images=data.get("remove_images", False),
             aggressive=data.get("aggressive", False),
             strip_metadata=data.get("strip_metadata", False),
+            linearize=data.get("linearize", False),
+            recompress_flate=data.get("recompress_flate", False),
         )
 
     def to_dict(self) -> dict:
@@ -45,4 +49,6 @@ class ReductionOptions:
             "remove_images": self.remove_images,
             "aggressive": self.aggressive,
             "strip_metadata": self.strip_metadata,
+            "linearize": self.linearize,
+            "recompress_flate": self.recompress_flate,
         }
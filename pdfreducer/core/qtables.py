@@ -0,0 +1,115 @@
+"""JPEG quantization table helpers."""
+
+import struct
+from typing import List, Optional, Sequence
+
+# Tables are 8x8, listed row by row (natural order, as Pillow expects).
+
+# Natural-order index of each coefficient in JPEG zigzag order
+ZIGZAG = [
+    0, 1, 8, 16, 9, 2, 3, 10,
+    17, 24, 32, 25, 18, 11, 4, 5,
+    12, 19, 26, 33, 40, 48, 41, 34,
+    27, 20, 13, 6, 7, 14, 21, 28,
+    35, 42, 49, 56, 57, 50, 43, 36,
+    29, 22, 15, 23, 30, 37, 44, 51,
+    58, 59, 52, 45, 38, 31, 39, 46,
+    53, 60, 61, 54, 47, 55, 62, 63,
+]
+
+# Standard luminance table (ITU-T T.81, Annex K)
+STD_LUMA = [
+    16, 11, 10, 16, 24, 40, 51, 61,
+    12, 12, 14, 19, 26, 58, 60, 55,
+    14, 13, 16, 24, 40, 57, 69, 56,
+    14, 17, 22, 29, 51, 87, 80, 62,
+    18, 22, 37, 56, 68, 109, 103, 77,
+    24, 35, 55, 64, 81, 104, 113, 92,
+    49, 64, 78, 87, 103, 121, 120, 101,
+    72, 92, 95, 98, 112, 100, 103, 99,
+]
+
+
+def scale_qtable(table: List[int], quality: int) -> List[int]:
+    """
+    Scale a base quantization table for a JPEG quality setting.
+
+    Uses the same formula as libjpeg's jpeg_quality_scaling, so quality 50
+    returns the base table unchanged.
+
+    Args:
+        table: 64-entry base table
+        quality: JPEG quality (1-100)
+
+    Returns:
+        Scaled table with entries clamped to the baseline range 1-255
+    """
+    scale = 5000 // quality if quality < 50 else 200 - quality * 2
+    return [min(255, max(1, (value * scale + 50) // 100)) for value in table]
+
+
+def estimate_jpeg_quality(data: bytes) -> Optional[int]:
+    """
+    Estimate the quality a JPEG was encoded with from its luma table.
+
+    Only the header is parsed, so this is cheap even for large images.
+    The luma table is matched against the standard table by least squares.
+
+    Args:
+        data: JPEG file bytes
+
+    Returns:
+        Estimated quality (1-100), or None if no luma table was found
+    """
+    if data[:2] != b"\xff\xd8":
+        return None
+
+    pos = 2
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            # Fill byte
+            pos += 1
+            continue
+        if marker == 0xDA:
+            # Start of scan, no more tables in the header
+            return None
+
+        (length,) = struct.unpack(">H", data[pos + 2:pos + 4])
+        if marker == 0xDB:
+            segment = data[pos + 4:pos + 2 + length]
+            i = 0
+            while i < len(segment):
+                precision, table_id = segment[i] >> 4, segment[i] & 0x0F
+                size = 128 if precision else 64
+                if precision > 1 or i + 1 + size > len(segment):
+                    # Malformed or truncated table
+                    return None
+                values = struct.unpack(">64H" if precision else "64B", segment[i + 1:i + 1 + size])
+                if table_id == 0:
+                    return _quality_from_table(values)
+                i += 1 + size
+        pos += 2 + length
+
+    return None
+
+
+def _quality_from_table(zigzag_values: Sequence[int]) -> int:
+    """Invert libjpeg quality scaling for a luma table given in zigzag order."""
+    table = [0] * 64
+    for k, value in enumerate(zigzag_values):
+        table[ZIGZAG[k]] = value
+
+    # Entries clamped at 255 no longer follow the scale, so leave them out
+    pairs = [(q, s) for q, s in zip(table, STD_LUMA) if q < 255]
+    if not pairs:
+        # Every entry clamped only happens at the very lowest quality
+        return 1
+    scale = 100 * sum(q * s for q, s in pairs) / sum(s * s for _, s in pairs)
+    if scale <= 100:
+        quality = (200 - scale) / 2
+    else:
+        quality = 5000 / scale
+    return min(100, max(1, round(quality)))
@@ -1,27 +1,46 @@
 """Main PDF reduction logic."""
 
+import hashlib
 import io
+import math
+import os
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Callable, Optional, Union
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 import pikepdf
 from PIL import Image
 
-from pdfreducer.core.image_optimizer import ImageOptimizer
+from pdfreducer.core.image_optimizer import ImageOptimizer, encode_jpeg, to_grayscale, warm_up_encoder
 from pdfreducer.core.options import ReductionOptions
+from pdfreducer.core.qtables import estimate_jpeg_quality
+
+# Below this many images, the cost of starting worker processes outweighs the gain
+PARALLEL_MIN_IMAGES = 4
+
+# Encoder threads used when images aren't sent to worker processes
+PIPELINE_THREADS = 2
+
+# Images smaller than this many pixels are sent to workers in batches
+SMALL_IMAGE_PIXELS = 256 * 256
+SMALL_IMAGE_BATCH = 32
 
 
 class PDFReducer:
     """Reduces PDF file sizes through various optimization techniques."""
 
-    def __init__(self, options: Optional[ReductionOptions] = None):
+    def __init__(self, options: Optional[ReductionOptions] = None, max_workers: Optional[int] = None):
         """
         Initialize the PDF reducer.
 
         Args:
             options: Reduction options. Uses defaults if not provided.
+            max_workers: Number of processes used for image optimization.
+                Defaults to the number of CPUs; 1 keeps the work in this
+                process, on a couple of encoder threads.
         """
         self.options = options or ReductionOptions()
+        self.max_workers = max_workers or os.cpu_count() or 1
         self.image_optimizer = ImageOptimizer(self.options)
 
     def reduce(
@@ -53,7 +72,8 @@ class PDFReducer:
 
         report(0, "Opening PDF...")
 
-        with pikepdf.open(input_path) as pdf:
+        # Memory-map the input so large image streams are paged in on demand
+        with pikepdf.open(input_path, access_mode=pikepdf.AccessMode.mmap) as pdf:
             total_pages = len(pdf.pages)
 
             # Process images if not removing them entirely
@@ -74,19 +94,22 @@ class PDFReducer:
             report(90, "Saving optimized PDF...")
 
             # Save with compression options
+            # Streams are written as-is unless content normalization needs them decoded
             # Note: normalize_content and linearize cannot be used together
             save_options = {
                 "compress_streams": True,
-                "stream_decode_level": pikepdf.StreamDecodeLevel.specialized,
+                "stream_decode_level": pikepdf.StreamDecodeLevel.none,
                 "object_stream_mode": pikepdf.ObjectStreamMode.generate,
-                "linearize": True,
+                "linearize": self.options.linearize,
             }
 
             if self.options.aggressive:
-                save_options["recompress_flate"] = True
                 # Use normalize_content for aggressive mode (disables linearize)
+                save_options["stream_decode_level"] = pikepdf.StreamDecodeLevel.specialized
                 save_options["linearize"] = False
                 save_options["normalize_content"] = True
+                if self.options.recompress_flate:
+                    save_options["recompress_flate"] = True
 
             pdf.save(output_path, **save_options)
 
@@ -100,150 +123,291 @@ class PDFReducer:
         total_pages: int,
     ):
         """Optimize images in the PDF."""
-        images_processed = 0
         images_to_process = []
+        masks = set()
 
-        # Collect all images first
-        for page_num, page in enumerate(pdf.pages):
-            if "/Resources" not in page:
+        # Collect all images first. Walking the object table visits each
+        # image once, however many pages use it, and also finds images
+        # inside form XObjects.
+        for obj in pdf.objects:
+            try:
+                if not isinstance(obj, pikepdf.Stream):
+                    continue
+                if obj.get("/Subtype") != "/Image":
+                    continue
+                # Soft masks and stencil masks are images too, but must stay lossless
+                for entry in ("/SMask", "/Mask"):
+                    mask = obj.get(entry)
+                    if isinstance(mask, pikepdf.Stream):
+                        masks.add(mask.objgen)
+
+                # Colour-key masks match exact sample values, which lossy JPEG can't keep
+                if isinstance(obj.get("/Mask"), pikepdf.Array):
+                    continue
+                images_to_process.append(obj)
+            except Exception:
                 continue
-            resources = page["/Resources"]
-            if "/XObject" not in resources:
+
+        # Group identical images so each is only optimized once. Copies of
+        # e.g. a logo are often stored as separate objects.
+        # Copies must share their stored length and image dictionary, so only
+        # streams that match another one on both are read and hashed here.
+        candidates: Dict[tuple, List[Tuple[dict, pikepdf.Stream]]] = {}
+        for xobj in images_to_process:
+            if xobj.objgen in masks:
                 continue
+            try:
+                entries = _image_entries(xobj)
+                # Skip streams that can't be re-encoded before reading anything
+                if not _is_supported_image(entries):
+                    continue
+                key = _image_shape_key(xobj, entries)
+            except Exception:
+                continue
+            candidates.setdefault(key, []).append((entries, xobj))
 
-            xobjects = resources["/XObject"]
-            for name, xobj_ref in xobjects.items():
+        groups: Dict[tuple, Tuple[dict, List[pikepdf.Stream]]] = {}
+        for shape_key, members in candidates.items():
+            if len(members) == 1:
+                entries, xobj = members[0]
+                groups[shape_key] = (entries, [xobj])
+                continue
+            for entries, xobj in members:
                 try:
-                    xobj = xobj_ref
-                    if not isinstance(xobj, pikepdf.Stream):
-                        continue
-                    if xobj.get("/Subtype") != "/Image":
-                        continue
-                    images_to_process.append((page_num, name, xobj))
+                    key = _image_key(xobj, entries)
                 except Exception:
                     continue
+                if key in groups:
+                    groups[key][1].append(xobj)
+                else:
+                    groups[key] = (entries, [xobj])
 
-        total_images = len(images_to_process)
+        total_images = len(groups)
         if total_images == 0:
             return
 
-        for idx, (page_num, name, xobj) in enumerate(images_to_process):
-            try:
-                self._process_single_image(pdf, xobj)
-                images_processed += 1
+        # Use the largest size at which any copy of an image is drawn
+        placements = self._image_placements(pdf)
+        image_groups = []
+        for entries, xobjs in groups.values():
+            sizes = [placements[xobj.objgen] for xobj in xobjs if xobj.objgen in placements]
+            placed_size = (max(w for w, _ in sizes), max(h for _, h in sizes)) if sizes else None
+            image_groups.append((entries, xobjs, placed_size))
+
+        if total_images < PARALLEL_MIN_IMAGES or self.max_workers <= 1:
+            # Pillow and libjpeg release the GIL, so background threads can
+            # encode while this thread reads and writes image streams
+            workers = PIPELINE_THREADS
+            executor = ThreadPoolExecutor(max_workers=workers)
+        else:
+            workers = self.max_workers
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=warm_up_encoder)
+
+        with executor:
+            results = self._optimize_pipelined(executor, image_groups, 2 * workers)
+
+            # Write optimized images back as results arrive
+            for idx, (xobjs, result) in enumerate(results):
+                if result is not None:
+                    for xobj in xobjs:
+                        try:
+                            self._write_image(xobj, *result)
+                        except Exception:
+                            # Skip problematic images
+                            pass
                 progress = 5 + (70 * (idx + 1) / total_images)
                 report(progress, f"Optimized image {idx + 1}/{total_images}")
+
+    def _optimize_pipelined(
+        self,
+        executor: Executor,
+        image_groups: List[Tuple[dict, List[pikepdf.Stream], Optional[Tuple[float, float]]]],
+        max_pending: int,
+    ) -> Iterator[Tuple[List[pikepdf.Stream], Optional[Tuple[bytes, int, int, str]]]]:
+        """
+        Optimize images on an executor, yielding results in completion order.
+
+        Image data is only read when an image is submitted, and at most
+        max_pending tasks are in flight, so large documents are never held
+        in memory all at once. Small images are submitted in batches so
+        per-task overhead doesn't dominate their processing time.
+        """
+        pending = {}
+        batch_groups, batch_params = [], []
+
+        def submit(groups, params_list):
+            pending[executor.submit(_optimize_image_batch, params_list, self.options)] = groups
+
+        def collect():
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from zip(pending.pop(future), future.result())
+
+        for entries, xobjs, placed_size in image_groups:
+            params = self._try_read_image_params(xobjs[0], entries, placed_size)
+            if params is None:
+                yield xobjs, None
+                continue
+
+            width, height = params[2:4]
+            if width * height < SMALL_IMAGE_PIXELS:
+                batch_groups.append(xobjs)
+                batch_params.append(params)
+                if len(batch_params) == SMALL_IMAGE_BATCH:
+                    submit(batch_groups, batch_params)
+                    batch_groups, batch_params = [], []
+            else:
+                submit([xobjs], [params])
+
+            while len(pending) >= max_pending:
+                yield from collect()
+
+        if batch_params:
+            submit(batch_groups, batch_params)
+
+        while pending:
+            yield from collect()
+
+    def _image_placements(self, pdf: pikepdf.Pdf) -> Dict[Tuple[int, int], Tuple[float, float]]:
+        """
+        Find the largest size at which each image is drawn on any page.
+
+        Returns:
+            Mapping of image objgen to (width, height) in PDF points
+        """
+        placements = {}
+        for page in pdf.pages:
+            try:
+                self._collect_placements(page.obj, page.get("/Resources"), pikepdf.Matrix(), placements, set())
             except Exception:
-                # Skip problematic images
                 continue
+        return placements
 
-    def _process_single_image(self, pdf: pikepdf.Pdf, xobj: pikepdf.Stream):
-        """Process a single image object."""
+    def _collect_placements(
+        self,
+        content: pikepdf.Object,
+        resources: Optional[pikepdf.Dictionary],
+        ctm: pikepdf.Matrix,
+        placements: Dict[Tuple[int, int], Tuple[float, float]],
+        forms: set,
+    ):
+        """Track the CTM through a content stream and record image sizes at each Do."""
+        if resources is None or "/XObject" not in resources:
+            return
+        xobjects = resources["/XObject"]
+        stack = []
+
+        for instruction in pikepdf.parse_content_stream(content, "q Q cm Do"):
+            operator = str(instruction.operator)
+            if operator == "q":
+                stack.append(ctm)
+            elif operator == "Q":
+                if stack:
+                    ctm = stack.pop()
+            elif operator == "cm":
+                ctm = pikepdf.Matrix(*(float(x) for x in instruction.operands)) @ ctm
+            elif operator == "Do":
+                xobj = xobjects.get(instruction.operands[0])
+                if not isinstance(xobj, pikepdf.Stream):
+                    continue
+                subtype = xobj.get("/Subtype")
+                if subtype == "/Image":
+                    # The image's unit square is mapped onto the page by the CTM
+                    width = math.hypot(ctm.a, ctm.b)
+                    height = math.hypot(ctm.c, ctm.d)
+                    prev_width, prev_height = placements.get(xobj.objgen, (0.0, 0.0))
+                    placements[xobj.objgen] = (max(prev_width, width), max(prev_height, height))
+                elif subtype == "/Form" and xobj.objgen not in forms:
+                    matrix = pikepdf.Matrix(xobj["/Matrix"]) if "/Matrix" in xobj else pikepdf.Matrix()
+                    self._collect_placements(
+                        xobj,
+                        xobj.get("/Resources", resources),
+                        matrix @ ctm,
+                        placements,
+                        forms | {xobj.objgen},
+                    )
+
+    def _try_read_image_params(
+        self,
+        xobj: pikepdf.Stream,
+        entries: dict,
+        placed_size: Optional[Tuple[float, float]],
+    ) -> Optional[tuple]:
+        """Read image parameters, returning None for images that can't be read."""
+        # Read image data on the main thread; workers never see pikepdf objects
         try:
-            # Get image dimensions
-            width = int(xobj.get("/Width", 0))
-            height = int(xobj.get("/Height", 0))
+            return self._read_image_params(xobj, entries, placed_size)
+        except Exception:
+            return None
 
-            if width == 0 or height == 0:
-                return
+    def _read_image_params(
+        self,
+        xobj: pikepdf.Stream,
+        entries: dict,
+        placed_size: Optional[Tuple[float, float]],
+    ) -> Optional[tuple]:
+        """
+        Extract everything needed to optimize an image outside of pikepdf.
 
-            # Extract image data
-            raw_data = xobj.read_raw_bytes()
+        Args:
+            xobj: Image stream
+            entries: Snapshot of the stream's dictionary from _image_entries
+            placed_size: Largest (width, height) in points at which the image
+                is drawn, if known
 
-            # Try to decode the image
-            pil_image = None
+        Returns:
+            Positional arguments for _optimize_image_bytes (minus options),
+            or None if the image can't be handled
+        """
+        # Get image dimensions
+        width = int(entries["/Width"] or 0)
+        height = int(entries["/Height"] or 0)
+
+        if width == 0 or height == 0:
+            return None
+
+        # Check for common image filters
+        filter_type = entries["/Filter"]
+        color_space = entries["/ColorSpace"]
+        color_space = str(color_space) if isinstance(color_space, pikepdf.Name) else None
+
+        if not _is_supported_image(entries):
+            return None
+
+        if placed_size:
+            # Effective resolution along the more demanding axis
+            current_dpi = min(
+                self.image_optimizer.estimate_image_dpi(width, placed_size[0]),
+                self.image_optimizer.estimate_image_dpi(height, placed_size[1]),
+            )
+        else:
+            # Not drawn from any page content; fall back to a rough estimate
+            current_dpi = max(width, height) / 10
 
-            # Check for common image filters
-            filter_type = xobj.get("/Filter")
+        # Extract image data
+        raw_data = xobj.read_raw_bytes()
 
-            if filter_type == "/DCTDecode":
-                # JPEG image
-                try:
-                    pil_image = Image.open(io.BytesIO(raw_data))
-                except Exception:
-                    return
-            elif filter_type == "/FlateDecode":
-                # Try to reconstruct from raw data
-                try:
-                    decoded = xobj.read_bytes()
-                    color_space = xobj.get("/ColorSpace")
-                    bits = int(xobj.get("/BitsPerComponent", 8))
-
-                    if color_space == "/DeviceRGB":
-                        mode = "RGB"
-                    elif color_space == "/DeviceGray":
-                        mode = "L"
-                    elif color_space == "/DeviceCMYK":
-                        mode = "CMYK"
-                    else:
-                        # Complex color space, skip
-                        return
-
-                    pil_image = Image.frombytes(mode, (width, height), decoded)
-                except Exception:
-                    return
-            else:
-                # Unsupported filter, skip
-                return
-
-            if pil_image is None:
-                return
-
-            # Convert to RGB for optimization
-            if pil_image.mode == "CMYK":
-                pil_image = pil_image.convert("RGB")
-            elif pil_image.mode == "L":
-                if not self.options.grayscale:
-                    pil_image = pil_image.convert("RGB")
-            elif pil_image.mode in ("RGBA", "P"):
-                background = Image.new("RGB", pil_image.size, (255, 255, 255))
-                if pil_image.mode == "P":
-                    pil_image = pil_image.convert("RGBA")
-                if pil_image.mode == "RGBA":
-                    background.paste(pil_image, mask=pil_image.split()[-1])
-                pil_image = background
-
-            # Apply grayscale if requested
-            if self.options.grayscale and pil_image.mode != "L":
-                pil_image = pil_image.convert("L")
-
-            # Resize based on DPI target
-            # Assume 72 DPI as base for PDF coordinates
-            current_dpi = max(width, height) / 10  # Rough estimate
-            if current_dpi > self.options.dpi:
-                scale = self.options.dpi / current_dpi
-                new_width = max(1, int(width * scale))
-                new_height = max(1, int(height * scale))
-                pil_image = pil_image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-
-            # Save optimized image
-            output = io.BytesIO()
-            if pil_image.mode == "L":
-                pil_image.save(output, format="JPEG", quality=self.options.quality, optimize=True)
-            else:
-                pil_image = pil_image.convert("RGB")
-                pil_image.save(output, format="JPEG", quality=self.options.quality, optimize=True)
-
-            optimized_data = output.getvalue()
-
-            # Only replace if smaller
-            if len(optimized_data) < len(raw_data):
-                # Update the image stream
-                xobj.write(optimized_data, filter=pikepdf.Name("/DCTDecode"))
-                xobj["/Width"] = pil_image.width
-                xobj["/Height"] = pil_image.height
-                xobj["/ColorSpace"] = pikepdf.Name("/DeviceGray" if pil_image.mode == "L" else "/DeviceRGB")
-                xobj["/BitsPerComponent"] = 8
-
-                # Remove any decode params that might conflict
-                if "/DecodeParms" in xobj:
-                    del xobj["/DecodeParms"]
-                if "/SMask" in xobj:
-                    del xobj["/SMask"]
+        if filter_type == "/DCTDecode":
+            if not _jpeg_needs_reencode(raw_data, width, height, color_space, current_dpi, self.options):
+                return None
+            image_data = raw_data
+        else:
+            image_data = xobj.read_bytes()
 
-        except Exception:
-            # Skip any problematic images
-            pass
+        return (image_data, len(raw_data), width, height, str(filter_type), color_space, current_dpi)
+
+    def _write_image(self, xobj: pikepdf.Stream, data: bytes, width: int, height: int, mode: str):
+        """Replace an image stream with optimized JPEG data."""
+        xobj.write(data, filter=pikepdf.Name("/DCTDecode"))
+        xobj["/Width"] = width
+        xobj["/Height"] = height
+        xobj["/ColorSpace"] = pikepdf.Name("/DeviceGray" if mode == "L" else "/DeviceRGB")
+        xobj["/BitsPerComponent"] = 8
+
+        # Remove any decode params that might conflict. A soft mask stays
+        # valid with DCTDecode (and may have its own size), so it is kept.
+        if "/DecodeParms" in xobj:
+            del xobj["/DecodeParms"]
 
     def _remove_images(
         self,
@@ -252,6 +416,9 @@ class PDFReducer:
         total_pages: int,
     ):
         """Remove all images from the PDF."""
+        # Pages often share one resource dictionary; only strip it once
+        stripped = set()
+
         for page_num, page in enumerate(pdf.pages):
             if "/Resources" not in page:
                 continue
@@ -260,6 +427,12 @@ class PDFReducer:
                 continue
 
             xobjects = resources["/XObject"]
+            shared = xobjects if xobjects.is_indirect else resources
+            if shared.is_indirect:
+                if shared.objgen in stripped:
+                    continue
+                stripped.add(shared.objgen)
+
             images_to_remove = []
 
             for name, xobj_ref in xobjects.items():
@@ -281,17 +454,198 @@ class PDFReducer:
 
     def _strip_metadata(self, pdf: pikepdf.Pdf):
         """Remove metadata from the PDF."""
-        # Clear document info
-        with pdf.open_metadata() as meta:
-            # Delete all metadata entries
-            for key in list(meta.keys()):
-                del meta[key]
+        # Drop the XMP metadata stream outright rather than parsing it
+        if "/Metadata" in pdf.Root:
+            del pdf.Root["/Metadata"]
 
         # Clear document info dictionary
         if "/Info" in pdf.trailer:
             del pdf.trailer["/Info"]
 
 
+# Stream entries that affect how an image's data is decoded
+_IMAGE_ENTRIES = ("/Width", "/Height", "/Filter", "/DecodeParms", "/ColorSpace", "/BitsPerComponent", "/Decode")
+
+
+def _image_entries(xobj: pikepdf.Stream) -> dict:
+    """Read the image's dictionary entries once, rather than on every lookup."""
+    return {entry: xobj.get(entry) for entry in _IMAGE_ENTRIES}
+
+
+def _image_shape_key(xobj: pikepdf.Stream, entries: dict) -> tuple:
+    """Key that identical image streams share, computed without reading the data."""
+    length = xobj.get("/Length")
+    return (None, int(length) if length is not None else None) + tuple(repr(entries[entry]) for entry in _IMAGE_ENTRIES)
+
+
+def _image_key(xobj: pikepdf.Stream, entries: dict) -> tuple:
+    """Key under which identical image streams optimize to identical output."""
+    digest = hashlib.sha1(xobj.read_raw_bytes()).digest()
+    return (digest,) + tuple(repr(entries[entry]) for entry in _IMAGE_ENTRIES)
+
+
+# Typical JPEG size per pixel at quality 80; anything below this is already compact
+JPEG_BYTES_PER_PIXEL_AT_Q80 = 0.3
+
+
+def _jpeg_needs_reencode(
+    raw_data: bytes,
+    width: int,
+    height: int,
+    color_space: Optional[str],
+    current_dpi: float,
+    options: ReductionOptions,
+) -> bool:
+    """
+    Decide from metadata alone whether re-encoding a JPEG could pay off.
+
+    An image that needs no resize or grayscale conversion is left alone if
+    it is already small per pixel, or was encoded at (or near) the target
+    quality.
+    """
+    if current_dpi > options.dpi:
+        return True
+    if options.grayscale and color_space != "/DeviceGray":
+        return True
+
+    bytes_per_pixel = len(raw_data) / (width * height)
+    if bytes_per_pixel < JPEG_BYTES_PER_PIXEL_AT_Q80 * options.quality / 80:
+        return False
+
+    existing_quality = estimate_jpeg_quality(raw_data)
+    if existing_quality is not None and existing_quality <= options.quality + 5:
+        return False
+
+    return True
+
+
+# PDF color spaces we can decode from raw FlateDecode samples
+_FLATE_MODES = {
+    "/DeviceRGB": "RGB",
+    "/DeviceGray": "L",
+    "/DeviceCMYK": "CMYK",
+}
+
+
+def _is_supported_image(entries: dict) -> bool:
+    """Check from the image dictionary alone whether the image can be re-encoded."""
+    filter_type = entries["/Filter"]
+    if filter_type == "/DCTDecode":
+        return True
+    if filter_type != "/FlateDecode":
+        # CCITT, JBIG2, JPX and filter chains are left alone
+        return False
+
+    # Only simple color spaces with 8-bit samples can be rebuilt
+    # (e.g. 1-bit black and white scans can't)
+    color_space = entries["/ColorSpace"]
+    if not isinstance(color_space, pikepdf.Name) or str(color_space) not in _FLATE_MODES:
+        return False
+    return int(entries["/BitsPerComponent"] or 8) == 8
+
+
+def _optimize_image_bytes(
+    image_data: bytes,
+    raw_size: int,
+    width: int,
+    height: int,
+    filter_type: str,
+    color_space: Optional[str],
+    current_dpi: float,
+    options: ReductionOptions,
+) -> Optional[Tuple[bytes, int, int, str]]:
+    """
+    Decode, resize and re-encode a single image as JPEG.
+
+    This runs in worker processes, so it only deals in plain Python values
+    and never touches pikepdf objects.
+
+    Args:
+        image_data: JPEG bytes for DCTDecode, decoded samples for FlateDecode
+        raw_size: Size of the image stream as currently stored in the PDF
+        width: Image width in pixels
+        height: Image height in pixels
+        filter_type: PDF filter name of the stream
+        color_space: PDF color space name, if it is a simple name
+        current_dpi: Estimated current DPI of the image
+        options: Reduction options
+
+    Returns:
+        Tuple of (JPEG bytes, width, height, mode), or None if the image
+        should be left as is
+    """
+    try:
+        # Target size based on DPI
+        new_size = None
+        if current_dpi > options.dpi:
+            scale = options.dpi / current_dpi
+            new_size = (max(1, int(width * scale)), max(1, int(height * scale)))
+
+        # Try to decode the image
+        pil_image = None
+
+        if filter_type == "/DCTDecode":
+            # JPEG image
+            try:
+                pil_image = Image.open(io.BytesIO(image_data))
+                if new_size:
+                    # Let libjpeg decode at 1/2, 1/4 or 1/8 scale
+                    pil_image.draft(None, new_size)
+            except Exception:
+                return None
+        elif filter_type == "/FlateDecode":
+            # Reconstruct from decoded samples
+            try:
+                mode = _FLATE_MODES[color_space]
+                # Gray and CMYK samples are mapped in place rather than copied
+                pil_image = Image.frombuffer(mode, (width, height), image_data, "raw", mode, 0, 1)
+            except Exception:
+                return None
+        else:
+            # Unsupported filter, skip
+            return None
+
+        # Flatten transparency onto a white background
+        if pil_image.mode in ("RGBA", "P"):
+            background = Image.new("RGB", pil_image.size, (255, 255, 255))
+            if pil_image.mode == "P":
+                pil_image = pil_image.convert("RGBA")
+            if pil_image.mode == "RGBA":
+                background.paste(pil_image, mask=pil_image.split()[-1])
+            pil_image = background
+
+        # Convert to the output mode in a single step
+        if options.grayscale:
+            pil_image = to_grayscale(pil_image)
+        elif pil_image.mode != "RGB":
+            pil_image = pil_image.convert("RGB")
+
+        # Resize based on DPI target: box-reduce to within 2x, then LANCZOS the remainder
+        if new_size and pil_image.size != new_size:
+            pil_image = pil_image.resize(new_size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+
+        # Save optimized image
+        optimized_data = encode_jpeg(pil_image, options.quality)
+
+        # Only replace if smaller
+        if len(optimized_data) >= raw_size:
+            return None
+
+        return optimized_data, pil_image.width, pil_image.height, pil_image.mode
+
+    except Exception:
+        # Skip any problematic images
+        return None
+
+
+def _optimize_image_batch(
+    batch: List[tuple],
+    options: ReductionOptions,
+) -> List[Optional[Tuple[bytes, int, int, str]]]:
+    """Run _optimize_image_bytes over a batch of images in one worker task."""
+    return [_optimize_image_bytes(*params, options) for params in batch]
+
+
 def reduce_pdf(
     input_path: Union[str, Path],
     output_path: Optional[Union[str, Path]] = None,
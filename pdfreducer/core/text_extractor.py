@@ -12,40 +12,20 @@ def table_to_markdown(table: list[list]) -> str:
         return ""
 
     # Clean cells: replace None with empty string, strip whitespace
-    cleaned = []
-    for row in table:
-        cleaned_row = [(cell or "").strip().replace("\n", " ") for cell in row]
-        cleaned.append(cleaned_row)
-
-    # Calculate column widths
-    col_count = max(len(row) for row in cleaned)
-    col_widths = [3] * col_count  # minimum width of 3
-
-    for row in cleaned:
-        for i, cell in enumerate(row):
-            if i < col_count:
-                col_widths[i] = max(col_widths[i], len(cell))
+    cleaned = [[(cell or "").strip().replace("\n", " ") for cell in row] for row in table]
 
     # Pad rows to have same number of columns
+    col_count = max(map(len, cleaned))
     for row in cleaned:
-        while len(row) < col_count:
-            row.append("")
-
-    # Build markdown table
-    lines = []
-
-    # Header row
-    header = "| " + " | ".join(cell.ljust(col_widths[i]) for i, cell in enumerate(cleaned[0])) + " |"
-    lines.append(header)
+        if len(row) < col_count:
+            row.extend([""] * (col_count - len(row)))
 
-    # Separator
-    separator = "|" + "|".join("-" * (w + 2) for w in col_widths) + "|"
-    lines.append(separator)
+    # Calculate column widths (minimum width of 3)
+    col_widths = [max(3, max(map(len, column))) for column in zip(*cleaned)]
 
-    # Data rows
-    for row in cleaned[1:]:
-        data_row = "| " + " | ".join(cell.ljust(col_widths[i]) for i, cell in enumerate(row)) + " |"
-        lines.append(data_row)
+    # Build markdown table: header row, separator, data rows
+    lines = ["| %s |" % " | ".join(map(str.ljust, row, col_widths)) for row in cleaned]
+    lines.insert(1, "|%s|" % "|".join(["-" * (w + 2) for w in col_widths]))
 
     return "\n".join(lines)
 
@@ -1,19 +1,22 @@
 """FastAPI web application for PDF Reducer."""
 
 import asyncio
-import io
-import json
+import hashlib
+import os
+import shutil
 import tempfile
+import uuid
 import zipfile
 from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import List
+from typing import Iterable, Iterator, List, Optional, Tuple
 
-from fastapi import FastAPI, File, Form, UploadFile, WebSocket, WebSocketDisconnect
-from fastapi.responses import FileResponse, HTMLResponse, StreamingResponse
+from fastapi import FastAPI, File, Form, Request, UploadFile, WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse, HTMLResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
 from pdfreducer.core.options import ReductionOptions
+from pdfreducer.web.encoding import FastJSONResponse, dumps_json
 from pdfreducer.web.queue import Job, processing_queue
 
 
@@ -29,12 +32,12 @@ OUTPUT_DIR.mkdir(exist_ok=True)
 async def lifespan(app: FastAPI):
     """Manage application lifespan."""
     # Startup
+    load_index_html()
     await processing_queue.start_worker()
     yield
     # Shutdown
     await processing_queue.stop_worker()
     # Clean up temp files
-    import shutil
     shutil.rmtree(TEMP_DIR, ignore_errors=True)
 
 
@@ -42,6 +45,7 @@ app = FastAPI(
     title="PDF Reducer",
     description="Reduce PDF file sizes",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # Mount static files
@@ -64,38 +68,72 @@ class ConnectionManager:
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
 
-    async def broadcast(self, message: dict):
-        disconnected = []
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception:
-                disconnected.append(connection)
+    async def broadcast(self, payload: str):
+        # Send the same encoded message to all clients concurrently
+        connections = list(self.active_connections)
+        results = await asyncio.gather(
+            *(connection.send_text(payload) for connection in connections),
+            return_exceptions=True,
+        )
 
-        for conn in disconnected:
-            self.disconnect(conn)
+        for conn, result in zip(connections, results):
+            if isinstance(result, Exception):
+                self.disconnect(conn)
 
 
 manager = ConnectionManager()
 
 
-async def job_update_callback(job: Job):
-    """Callback for job updates - broadcasts to all WebSocket clients."""
-    await manager.broadcast({
-        "type": "job_update",
-        "job": job.to_dict(),
-    })
+def jobs_payload(jobs: List[Job], message_type: Optional[str] = None) -> str:
+    """Build a JSON object with a "jobs" list from each job's cached JSON."""
+    jobs_json = ",".join(job.to_json() for job in jobs)
+    if message_type is None:
+        return '{"jobs":[%s]}' % jobs_json
+    return '{"type":%s,"jobs":[%s]}' % (dumps_json(message_type), jobs_json)
+
+
+async def job_update_callback(jobs: List[Job]):
+    """Callback for job updates - broadcasts each batch to all WebSocket clients."""
+    await manager.broadcast(jobs_payload(jobs, "job_updates"))
+
+
+async def jobs_removed_callback(job_ids: List[str]):
+    """Callback for removed jobs - tells all WebSocket clients to drop them."""
+    await manager.broadcast(dumps_json({
+        "type": "jobs_removed",
+        "ids": job_ids,
+    }))
 
 
-# Register the callback
+# Register the callbacks
 processing_queue.on_update(job_update_callback)
+processing_queue.on_remove(jobs_removed_callback)
+
+
+# Main page, loaded once at startup
+INDEX_HTML: Optional[bytes] = None
+INDEX_ETAG: Optional[str] = None
+
+
+def load_index_html():
+    """Read the main page into memory and compute its ETag."""
+    global INDEX_HTML, INDEX_ETAG
+    INDEX_HTML = (STATIC_DIR / "index.html").read_bytes()
+    INDEX_ETAG = f'"{hashlib.sha1(INDEX_HTML).hexdigest()}"'
 
 
 @app.get("/", response_class=HTMLResponse)
-async def root():
+async def root(request: Request):
     """Serve the main page."""
-    html_path = STATIC_DIR / "index.html"
-    return HTMLResponse(content=html_path.read_text())
+    if INDEX_HTML is None:
+        load_index_html()
+
+    # Let browsers reuse their cached copy
+    if_none_match = request.headers.get("if-none-match", "")
+    if INDEX_ETAG in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers={"ETag": INDEX_ETAG})
+
+    return HTMLResponse(content=INDEX_HTML, headers={"ETag": INDEX_ETAG})
 
 
 def parse_bool(value: str) -> bool:
@@ -103,6 +141,16 @@ def parse_bool(value: str) -> bool:
     return value.lower() in ("true", "1", "yes", "on")
 
 
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+
+def save_upload(file: UploadFile, path: Path):
+    """Copy an uploaded file to disk in chunks."""
+    file.file.seek(0)
+    with open(path, "wb") as out:
+        shutil.copyfileobj(file.file, out, UPLOAD_CHUNK_SIZE)
+
+
 @app.post("/api/upload")
 async def upload_file(
     file: UploadFile = File(...),
@@ -120,16 +168,17 @@ async def upload_file(
         return {"error": "Only PDF files are allowed"}
 
     # Save uploaded file
-    input_path = UPLOAD_DIR / f"{processing_queue.jobs.__len__()}_{file.filename}"
+    # A random prefix keeps uploads with the same name from overwriting each other
+    input_path = UPLOAD_DIR / f"{uuid.uuid4().hex}_{Path(file.filename).name}"
 
     # Set output path based on mode
     if mode == "extract":
-        output_path = OUTPUT_DIR / f"{Path(file.filename).stem}.txt"
+        output_path = OUTPUT_DIR / f"{input_path.stem}.txt"
     else:
         output_path = OUTPUT_DIR / f"{input_path.stem}_reduced.pdf"
 
-    content = await file.read()
-    input_path.write_bytes(content)
+    # Stream to disk off the event loop instead of reading it all into memory
+    await asyncio.get_running_loop().run_in_executor(None, save_upload, file, input_path)
 
     # Create options
     options = ReductionOptions(
@@ -154,11 +203,65 @@ async def upload_file(
     return {"job_id": job.id, "job": job.to_dict()}
 
 
+ZIP_CHUNK_SIZE = 1 << 20
+
+
+class ZipChunkWriter:
+    """Unseekable file object that collects ZIP output for streaming."""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        """Return and forget everything written so far."""
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def iter_zip(files: Iterable[Tuple[Path, str, int]]) -> Iterator[bytes]:
+    """
+    Build a ZIP archive incrementally, yielding it in chunks.
+
+    Each file is given as (path, name in archive, compression type).
+
+    Starlette runs sync iterators in a thread pool, so the archive is
+    built off the event loop and never held in memory as a whole.
+    """
+    writer = ZipChunkWriter()
+    with zipfile.ZipFile(writer, "w") as zip_file:
+        for path, arcname, compression in files:
+            info = zipfile.ZipInfo.from_file(path, arcname)
+            info.compress_type = compression
+            with open(path, "rb") as src, zip_file.open(info, "w") as dst:
+                while chunk := src.read(ZIP_CHUNK_SIZE):
+                    dst.write(chunk)
+                    data = writer.drain()
+                    if data:
+                        yield data
+    yield writer.drain()
+
+
+def iter_csv_files(csv_dir: Path) -> Iterator[Tuple[Path, str, int]]:
+    """List CSV files to zip; runs lazily inside iter_zip, off the event loop."""
+    with os.scandir(csv_dir) as entries:
+        names = sorted(entry.name for entry in entries if entry.name.endswith(".csv") and entry.is_file())
+    for name in names:
+        yield csv_dir / name, name, zipfile.ZIP_DEFLATED
+
+
 @app.get("/api/jobs")
 async def list_jobs():
     """List all jobs."""
     jobs = await processing_queue.get_all_jobs()
-    return {"jobs": [job.to_dict() for job in jobs]}
+    return Response(content=jobs_payload(jobs), media_type="application/json")
 
 
 @app.get("/api/jobs/{job_id}")
@@ -198,7 +301,10 @@ async def download_file(job_id: str):
     if not job:
         return {"error": "Job not found"}
 
-    if not job.output_path.exists():
+    # Stat once here and hand the result to FileResponse so it doesn't stat again
+    try:
+        stat_result = os.stat(job.output_path)
+    except FileNotFoundError:
         return {"error": "Output file not found"}
 
     if job.mode == "extract":
@@ -206,12 +312,14 @@ async def download_file(job_id: str):
             path=job.output_path,
             filename=f"{Path(job.filename).stem}.txt",
             media_type="text/plain; charset=utf-8",
+            stat_result=stat_result,
         )
     else:
         return FileResponse(
             path=job.output_path,
             filename=f"{Path(job.filename).stem}_reduced.pdf",
             media_type="application/pdf",
+            stat_result=stat_result,
         )
 
 
@@ -225,16 +333,9 @@ async def download_csv(job_id: str):
     if not job.csv_dir or not job.csv_dir.exists():
         return {"error": "No CSV files available"}
 
-    # Create ZIP of CSV files
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-        for csv_file in job.csv_dir.glob("*.csv"):
-            zip_file.write(csv_file, csv_file.name)
-
-    zip_buffer.seek(0)
-
+    # Stream a ZIP of the CSV files
     return StreamingResponse(
-        zip_buffer,
+        iter_zip(iter_csv_files(job.csv_dir)),
         media_type="application/zip",
         headers={"Content-Disposition": f"attachment; filename={Path(job.filename).stem}_tables.zip"},
     )
@@ -252,20 +353,20 @@ async def download_all():
     if not completed_jobs:
         return {"error": "No completed files to download"}
 
-    # Create ZIP in memory
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-        for job in completed_jobs:
-            if job.mode == "extract":
-                filename = f"{Path(job.filename).stem}.txt"
-            else:
-                filename = f"{Path(job.filename).stem}_reduced.pdf"
-            zip_file.write(job.output_path, filename)
-
-    zip_buffer.seek(0)
-
+    files = []
+    for job in completed_jobs:
+        if job.mode == "extract":
+            filename = f"{Path(job.filename).stem}.txt"
+            compression = zipfile.ZIP_DEFLATED
+        else:
+            # Reduced PDFs are already compressed, deflating again gains nothing
+            filename = f"{Path(job.filename).stem}_reduced.pdf"
+            compression = zipfile.ZIP_STORED
+        files.append((job.output_path, filename, compression))
+
+    # Stream the ZIP as it is built
     return StreamingResponse(
-        zip_buffer,
+        iter_zip(files),
         media_type="application/zip",
         headers={"Content-Disposition": "attachment; filename=processed_files.zip"},
     )
@@ -276,19 +377,20 @@ async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time updates."""
     await manager.connect(websocket)
 
-    # Send current jobs on connect
-    jobs = await processing_queue.get_all_jobs()
-    await websocket.send_json({
-        "type": "initial_jobs",
-        "jobs": [job.to_dict() for job in jobs],
-    })
-
     try:
+        # Send current jobs on connect
+        jobs = await processing_queue.get_all_jobs()
+        await websocket.send_text(jobs_payload(jobs, "initial_jobs"))
+
+        # The client only listens and uvicorn's ping frames handle liveness,
+        # so incoming messages are ignored until the disconnect arrives
         while True:
-            # Keep connection alive, handle any incoming messages
-            data = await websocket.receive_text()
-            # Could handle client messages here if needed
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
     except WebSocketDisconnect:
+        pass
+    finally:
         manager.disconnect(websocket)
 
 
@@ -0,0 +1,27 @@
+"""JSON encoding for API responses and WebSocket updates."""
+
+import json
+
+from fastapi.responses import JSONResponse
+
+# Optional faster JSON encoding (pip install pdfreducer[fast])
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps_json(content) -> str:
+    """Encode content as a JSON string, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(content).decode()
+    return json.dumps(content)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson when it is installed."""
+
+    def render(self, content) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content)
+        return super().render(content)
@@ -1,7 +1,16 @@
 """Processing queue for PDF reduction jobs."""
 
 import asyncio
+import functools
+import multiprocessing
+import os
+import queue
+import shutil
+import threading
+import time
 import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -11,6 +20,24 @@ from typing import Callable, Dict, List, Optional
 from pdfreducer.core.options import ReductionOptions
 from pdfreducer.core.reducer import PDFReducer
 from pdfreducer.core.text_extractor import extract_text
+from pdfreducer.web.encoding import dumps_json
+
+# Seconds between batched job update notifications
+UPDATE_INTERVAL = 0.1
+
+# Number of jobs processed at once, overridable from the environment
+CONCURRENCY_ENV = "PDFREDUCER_CONCURRENCY"
+
+# Finished jobs and their files are removed after this many seconds
+JOB_TTL = 60 * 60
+
+# Oldest finished jobs are evicted beyond this many jobs
+MAX_JOBS = 1000
+
+# Progress ticks are dropped unless they move this many percent or arrive
+# this many seconds after the last tick sent
+PROGRESS_MIN_STEP = 1.0
+PROGRESS_MIN_INTERVAL = 0.05
 
 
 class JobStatus(str, Enum):
@@ -42,9 +69,37 @@ class Job:
     error: Optional[str] = None
     created_at: datetime = field(default_factory=datetime.now)
     completed_at: Optional[datetime] = None
+    _cached_dict: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
+    _cached_json: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name, value):
+        # Any change to the job invalidates its serialized forms
+        object.__setattr__(self, name, value)
+        if name not in ("_cached_dict", "_cached_json"):
+            object.__setattr__(self, "_cached_dict", None)
+            object.__setattr__(self, "_cached_json", None)
+        # Timestamps are formatted once, when they are set
+        if name in ("created_at", "completed_at"):
+            object.__setattr__(self, f"_{name}_iso", value.isoformat() if value else None)
 
     def to_dict(self) -> dict:
-        """Convert job to dictionary for JSON serialization."""
+        """
+        Convert job to dictionary for JSON serialization.
+
+        The dictionary is cached until the job changes, so callers must
+        not modify it.
+        """
+        if self._cached_dict is None:
+            self._cached_dict = self._build_dict()
+        return self._cached_dict
+
+    def to_json(self) -> str:
+        """Return the job encoded as JSON, cached like to_dict()."""
+        if self._cached_json is None:
+            self._cached_json = dumps_json(self.to_dict())
+        return self._cached_json
+
+    def _build_dict(self) -> dict:
         return {
             "id": self.id,
             "filename": self.filename,
@@ -57,38 +112,81 @@ class Job:
             "original_size": self.original_size,
             "reduced_size": self.reduced_size,
             "error": self.error,
-            "created_at": self.created_at.isoformat(),
-            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "created_at": self._created_at_iso,
+            "completed_at": self._completed_at_iso,
         }
 
 
 class ProcessingQueue:
     """Manages a queue of PDF reduction jobs."""
 
-    def __init__(self):
+    def __init__(self, concurrency: Optional[int] = None):
         self.jobs: Dict[str, Job] = {}
         self.queue: asyncio.Queue[str] = asyncio.Queue()
-        self.worker_task: Optional[asyncio.Task] = None
-        self.update_callbacks: List[Callable[[Job], None]] = []
-        self._lock = asyncio.Lock()
-
-    def on_update(self, callback: Callable[[Job], None]):
-        """Register a callback for job updates."""
+        concurrency = concurrency or int(os.environ.get(CONCURRENCY_ENV, 0))
+        self.concurrency = max(1, concurrency or os.cpu_count() or 1)
+        # Split the cores between jobs running at the same time
+        self.image_workers = max(1, (os.cpu_count() or 1) // self.concurrency)
+        self.worker_tasks: List[asyncio.Task] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._progress_queue: Optional[multiprocessing.Queue] = None
+        self.update_callbacks: List[Callable[[List[Job]], None]] = []
+        self.remove_callbacks: List[Callable[[List[str]], None]] = []
+        self._dirty: Dict[str, Job] = {}
+        self._removed: Dict[str, None] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def on_update(self, callback: Callable[[List[Job]], None]):
+        """Register a callback for batches of job updates."""
         self.update_callbacks.append(callback)
 
-    def remove_callback(self, callback: Callable[[Job], None]):
+    def remove_callback(self, callback: Callable[[List[Job]], None]):
         """Remove an update callback."""
         if callback in self.update_callbacks:
             self.update_callbacks.remove(callback)
 
-    async def _notify_update(self, job: Job):
-        """Notify all registered callbacks of a job update."""
-        for callback in self.update_callbacks:
+    def on_remove(self, callback: Callable[[List[str]], None]):
+        """Register a callback for batches of removed job IDs."""
+        self.remove_callbacks.append(callback)
+
+    def _notify_update(self, job: Job):
+        """Mark a job as changed; updates are sent in batches."""
+        self._dirty[job.id] = job
+        self._schedule_flush()
+
+    def _notify_removed(self, job_id: str):
+        """Mark a job as removed; removals are sent with the next batch."""
+        self._removed[job_id] = None
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Make sure a task is running to send pending notifications."""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_updates())
+
+    async def _flush_updates(self):
+        """Send pending job updates to callbacks, coalescing rapid changes."""
+        while self._dirty or self._removed:
+            await asyncio.sleep(UPDATE_INTERVAL)
+            # Only the latest state of each job is sent; removed jobs are dropped
+            jobs = [job for job_id, job in self._dirty.items() if job_id in self.jobs]
+            removed = list(self._removed)
+            self._dirty.clear()
+            self._removed.clear()
+            if jobs:
+                await self._send(self.update_callbacks, jobs)
+            if removed:
+                await self._send(self.remove_callbacks, removed)
+
+    async def _send(self, callbacks: List[Callable], batch: list):
+        """Notify registered callbacks of a batch of updates or removals."""
+        for callback in callbacks:
             try:
                 if asyncio.iscoroutinefunction(callback):
-                    await callback(job)
+                    await callback(batch)
                 else:
-                    callback(job)
+                    callback(batch)
             except Exception:
                 pass
 
@@ -104,6 +202,8 @@ class ProcessingQueue:
     ) -> Job:
         """Add a new job to the queue."""
         job_id = str(uuid.uuid4())
+        # Stat off the event loop in case the temp dir is on a slow filesystem
+        original_size = await asyncio.get_running_loop().run_in_executor(None, os.path.getsize, input_path)
 
         job = Job(
             id=job_id,
@@ -113,27 +213,25 @@ class ProcessingQueue:
             options=options,
             mode=mode,
             extract_csv=extract_csv,
-            original_size=input_path.stat().st_size,
+            original_size=original_size,
         )
 
-        async with self._lock:
-            self.jobs[job_id] = job
+        self._evict_finished(MAX_JOBS - 1)
+        self.jobs[job_id] = job
 
         if auto_process:
             await self.queue.put(job_id)
-        await self._notify_update(job)
+        self._notify_update(job)
 
         return job
 
     async def start_processing(self) -> int:
         """Start processing all pending jobs. Returns number of jobs queued."""
-        count = 0
-        async with self._lock:
-            for job_id, job in self.jobs.items():
-                if job.status == JobStatus.PENDING:
-                    await self.queue.put(job_id)
-                    count += 1
-        return count
+        # Snapshot first so the dict is never iterated across an await
+        pending = [job_id for job_id, job in self.jobs.items() if job.status == JobStatus.PENDING]
+        for job_id in pending:
+            await self.queue.put(job_id)
+        return len(pending)
 
     async def get_job(self, job_id: str) -> Optional[Job]:
         """Get a job by ID."""
@@ -145,27 +243,33 @@ class ProcessingQueue:
 
     async def remove_job(self, job_id: str) -> bool:
         """Remove a job and its files."""
-        async with self._lock:
-            if job_id not in self.jobs:
-                return False
-
-            job = self.jobs[job_id]
-
-            # Clean up files
-            try:
-                if job.input_path.exists():
-                    job.input_path.unlink()
-            except Exception:
-                pass
-
+        job = self.jobs.pop(job_id, None)
+        if job is None:
+            return False
+        self._notify_removed(job_id)
+
+        # Clean up files off the event loop
+        await asyncio.get_running_loop().run_in_executor(None, self._remove_files, job)
+        return True
+
+    def _discard_job(self, job_id: str):
+        """Remove a job right away, deleting its files in the background."""
+        job = self.jobs.pop(job_id, None)
+        if job is None:
+            return
+        self._notify_removed(job_id)
+        asyncio.get_running_loop().run_in_executor(None, self._remove_files, job)
+
+    @staticmethod
+    def _remove_files(job: Job):
+        """Delete a job's input, output and CSV files."""
+        for path in (job.input_path, job.output_path):
             try:
-                if job.output_path.exists():
-                    job.output_path.unlink()
+                path.unlink(missing_ok=True)
             except Exception:
                 pass
-
-            del self.jobs[job_id]
-            return True
+        if job.csv_dir is not None:
+            shutil.rmtree(job.csv_dir, ignore_errors=True)
 
     async def clear_completed(self) -> int:
         """Remove all completed jobs."""
@@ -180,19 +284,115 @@ class ProcessingQueue:
 
         return len(to_remove)
 
+    def _evict_finished(self, limit: int):
+        """Remove the oldest finished jobs until at most `limit` jobs remain."""
+        excess = len(self.jobs) - limit
+        if excess <= 0:
+            return
+        # Jobs are kept in insertion order; pending and running jobs are never evicted
+        finished = [
+            job_id
+            for job_id, job in self.jobs.items()
+            if job.status in (JobStatus.COMPLETED, JobStatus.FAILED)
+        ]
+        for job_id in finished[:excess]:
+            self._discard_job(job_id)
+
+    def _expire_job(self, job_id: str):
+        """Remove a finished job once its time to live has passed."""
+        self._discard_job(job_id)
+
     async def start_worker(self):
-        """Start the background worker."""
-        if self.worker_task is None or self.worker_task.done():
-            self.worker_task = asyncio.create_task(self._worker())
+        """Start the background workers."""
+        if self._process_pool is None:
+            self._start_reduce_pool()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.concurrency, thread_name_prefix="pdfreducer-job")
+
+        self.worker_tasks = [task for task in self.worker_tasks if not task.done()]
+        while len(self.worker_tasks) < self.concurrency:
+            self.worker_tasks.append(asyncio.create_task(self._worker()))
 
     async def stop_worker(self):
-        """Stop the background worker."""
-        if self.worker_task and not self.worker_task.done():
-            self.worker_task.cancel()
+        """Stop the background workers."""
+        tasks = [task for task in (*self.worker_tasks, self._flush_task) if task and not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.worker_tasks = []
+
+        if self._process_pool is not None:
+            self._stop_reduce_pool()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _start_reduce_pool(self):
+        """Create the reduce process pool along with its progress queue and pump."""
+        # Reduction is CPU-bound, so it runs in worker processes that
+        # report progress back through a shared queue
+        self._progress_queue = multiprocessing.Queue()
+        self._process_pool = ProcessPoolExecutor(
+            self.concurrency,
+            initializer=_init_reduce_worker,
+            initargs=(self._progress_queue,),
+        )
+        threading.Thread(
+            target=self._pump_progress,
+            args=(self._progress_queue, asyncio.get_running_loop()),
+            name="pdfreducer-progress",
+            daemon=True,
+        ).start()
+
+    def _stop_reduce_pool(self):
+        """Shut down the reduce process pool and stop its progress pump."""
+        self._process_pool.shutdown(wait=False, cancel_futures=True)
+        self._progress_queue.put(None)
+        self._process_pool = None
+        self._progress_queue = None
+
+    def _replace_broken_pool(self, broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        """Replace the reduce pool if it is still the broken one, returning the current pool."""
+        # Several jobs can see the same breakage; only the first rebuilds the pool
+        if self._process_pool is broken:
+            self._stop_reduce_pool()
+            self._start_reduce_pool()
+        return self._process_pool
+
+    def _pump_progress(self, progress_queue: multiprocessing.Queue, loop: asyncio.AbstractEventLoop):
+        """Forward progress reported by worker processes to the event loop."""
+        running = True
+        while running:
+            # Block for one tick, then take whatever else is already waiting
+            items = [progress_queue.get()]
+            while True:
+                try:
+                    items.append(progress_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in items:
+                running = False
+
+            # Keep only the latest tick per job and wake the loop once
+            latest = {item[0]: item for item in items if item is not None}
+            if not latest:
+                continue
             try:
-                await self.worker_task
-            except asyncio.CancelledError:
-                pass
+                loop.call_soon_threadsafe(self._apply_progress, list(latest.values()))
+            except RuntimeError:
+                # Event loop closed
+                break
+
+    def _apply_progress(self, ticks: List[tuple]):
+        """Record progress for running jobs from (job_id, pct, msg) ticks."""
+        for job_id, pct, msg in ticks:
+            job = self.jobs.get(job_id)
+            # Ticks can arrive after the job has already finished
+            if job is None or job.status != JobStatus.PROCESSING:
+                continue
+            job.progress = pct
+            job.message = msg
+            self._notify_update(job)
 
     async def _worker(self):
         """Background worker that processes jobs."""
@@ -200,30 +400,35 @@ class ProcessingQueue:
             try:
                 job_id = await self.queue.get()
 
-                if job_id not in self.jobs:
+                job = self.jobs.get(job_id)
+                # Skip removed jobs and ids queued more than once
+                if job is None or job.status != JobStatus.PENDING:
+                    self.queue.task_done()
                     continue
 
-                job = self.jobs[job_id]
                 job.status = JobStatus.PROCESSING
                 job.message = "Starting..."
-                await self._notify_update(job)
+                self._notify_update(job)
 
                 try:
                     await self._process_job(job)
+                    reduced_size = await asyncio.get_running_loop().run_in_executor(
+                        None, _file_size, job.output_path
+                    )
+                    # No awaits from here on, so a flush never sees a half-finished job
                     job.status = JobStatus.COMPLETED
                     job.progress = 100.0
                     job.message = "Complete!"
                     job.completed_at = datetime.now()
-
-                    if job.output_path.exists():
-                        job.reduced_size = job.output_path.stat().st_size
+                    job.reduced_size = reduced_size
 
                 except Exception as e:
                     job.status = JobStatus.FAILED
                     job.error = str(e)
                     job.message = f"Error: {e}"
 
-                await self._notify_update(job)
+                asyncio.get_running_loop().call_later(JOB_TTL, self._expire_job, job_id)
+                self._notify_update(job)
                 self.queue.task_done()
 
             except asyncio.CancelledError:
@@ -242,24 +447,36 @@ class ProcessingQueue:
 
     async def _process_reduce(self, job: Job, loop):
         """Process a PDF reduction job."""
-
-        def progress_callback(pct: float, msg: str):
-            job.progress = pct
-            job.message = msg
-            asyncio.run_coroutine_threadsafe(self._notify_update(job), loop)
-
-        reducer = PDFReducer(job.options)
-
-        await loop.run_in_executor(
-            None,
-            lambda: reducer.reduce(job.input_path, job.output_path, progress_callback),
+        task = functools.partial(
+            _reduce_entry,
+            job.id,
+            job.input_path,
+            job.output_path,
+            job.options,
+            self.image_workers,
         )
 
+        pool = self._process_pool
+        try:
+            future = loop.run_in_executor(pool, task)
+        except BrokenProcessPool:
+            # The pool broke before this job started, so run it on a fresh one
+            pool = self._replace_broken_pool(pool)
+            future = loop.run_in_executor(pool, task)
+
+        try:
+            await future
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for running out of memory); fail only
+            # the jobs that were running and give later jobs a working pool
+            self._replace_broken_pool(pool)
+            raise
+
     async def _process_extract(self, job: Job, loop):
         """Process a text extraction job."""
         job.message = "Extracting text..."
         job.progress = 10.0
-        await self._notify_update(job)
+        self._notify_update(job)
 
         def do_extract():
             text, csv_tables = extract_text(job.input_path, extract_csv=job.extract_csv)
@@ -277,7 +494,7 @@ class ProcessingQueue:
 
             return len(text), len(csv_tables) if csv_tables else 0
 
-        text_length, table_count = await loop.run_in_executor(None, do_extract)
+        text_length, table_count = await loop.run_in_executor(self._executor, do_extract)
 
         job.progress = 100.0
         if table_count > 0:
@@ -286,5 +503,47 @@ class ProcessingQueue:
             job.message = f"Extracted {text_length:,} characters"
 
 
+def _file_size(path: Path) -> int:
+    """Return the size of a file, or 0 if it doesn't exist."""
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+# Progress queue of the current reduce worker process
+_worker_progress_queue: Optional[multiprocessing.Queue] = None
+
+
+def _init_reduce_worker(progress_queue: multiprocessing.Queue):
+    """Initializer for reduce worker processes."""
+    global _worker_progress_queue
+    _worker_progress_queue = progress_queue
+
+
+def _reduce_entry(
+    job_id: str,
+    input_path: Path,
+    output_path: Path,
+    options: ReductionOptions,
+    max_workers: int,
+):
+    """Reduce a PDF in a worker process, reporting progress to the parent."""
+    last_pct = -PROGRESS_MIN_STEP
+    last_time = 0.0
+
+    def progress_callback(pct: float, msg: str):
+        nonlocal last_pct, last_time
+        now = time.monotonic()
+        # Phase changes always move progress by several percent, so only
+        # rapid per-image ticks are dropped
+        if pct < 100 and pct - last_pct < PROGRESS_MIN_STEP and now - last_time < PROGRESS_MIN_INTERVAL:
+            return
+        last_pct, last_time = pct, now
+        _worker_progress_queue.put((job_id, pct, msg))
+
+    PDFReducer(options, max_workers=max_workers).reduce(input_path, output_path, progress_callback)
+
+
 # Global queue instance
 processing_queue = ProcessingQueue()
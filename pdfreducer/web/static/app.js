@@ -182,8 +182,17 @@ class PDFReducerApp {
                 this.renderQueue();
                 break;
 
-            case 'job_update':
-                this.jobs.set(data.job.id, data.job);
+            case 'job_updates':
+                data.jobs.forEach(job => {
+                    this.jobs.set(job.id, job);
+                });
+                this.renderQueue();
+                break;
+
+            case 'jobs_removed':
+                data.ids.forEach(id => {
+                    this.jobs.delete(id);
+                });
                 this.renderQueue();
                 break;
         }
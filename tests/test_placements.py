@@ -0,0 +1,91 @@
+"""Tests for tracking the size at which images are drawn."""
+
+import io
+
+import pikepdf
+import pytest
+from PIL import Image
+
+from pdfreducer.core.options import ReductionOptions
+from pdfreducer.core.reducer import PDFReducer, _image_entries
+
+
+def jpeg_image(pdf: pikepdf.Pdf, width: int, height: int) -> pikepdf.Stream:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 100, 50)).save(buffer, "JPEG")
+    image = pikepdf.Stream(pdf, buffer.getvalue())
+    image.Type = pikepdf.Name.XObject
+    image.Subtype = pikepdf.Name.Image
+    image.Width = width
+    image.Height = height
+    image.ColorSpace = pikepdf.Name.DeviceRGB
+    image.BitsPerComponent = 8
+    image.Filter = pikepdf.Name.DCTDecode
+    return pdf.make_indirect(image)
+
+
+@pytest.fixture
+def document():
+    pdf = pikepdf.new()
+    page_image = jpeg_image(pdf, 400, 200)
+    form_image = jpeg_image(pdf, 300, 300)
+    unused_image = jpeg_image(pdf, 500, 250)
+
+    # Form that draws its image at 30x20 units, scaled 2x and rotated 90 degrees by /Matrix
+    form = pikepdf.Stream(pdf, b"q 30 0 0 20 0 0 cm /Im1 Do Q")
+    form.Type = pikepdf.Name.XObject
+    form.Subtype = pikepdf.Name.Form
+    form.BBox = [0, 0, 30, 20]
+    form.Matrix = [0, 2, -2, 0, 0, 0]
+    form.Resources = pikepdf.Dictionary(XObject=pikepdf.Dictionary(Im1=form_image))
+    form = pdf.make_indirect(form)
+
+    page = pdf.add_blank_page(page_size=(612, 792))
+    page.Resources = pikepdf.Dictionary(
+        XObject=pikepdf.Dictionary(Im0=page_image, Fm0=form, Im2=unused_image)
+    )
+    page.Contents = pdf.make_stream(
+        b"q 200 0 0 100 50 50 cm /Im0 Do Q "
+        b"q 1.5 0 0 1.5 100 300 cm /Fm0 Do Q "
+        b"q 100 0 0 50 300 50 cm /Im0 Do Q"
+    )
+    return pdf, (page_image, form_image, unused_image)
+
+
+def test_placement_of_scaled_page_image(document):
+    pdf, (page_image, _, _) = document
+    placements = PDFReducer()._image_placements(pdf)
+
+    # Drawn twice; the larger placement wins
+    assert placements[page_image.objgen] == pytest.approx((200, 100))
+
+
+def test_placement_inside_form_applies_matrix(document):
+    pdf, (_, form_image, _) = document
+    placements = PDFReducer()._image_placements(pdf)
+
+    # 30x20 in the form, scaled by 2 from /Matrix and 1.5 from the page's cm
+    assert placements[form_image.objgen] == pytest.approx((90, 60))
+
+
+def test_undrawn_image_has_no_placement(document):
+    pdf, (_, _, unused_image) = document
+    assert unused_image.objgen not in PDFReducer()._image_placements(pdf)
+
+
+# Grayscale conversion makes every color image a candidate for re-encoding
+def test_dpi_from_placement(document):
+    pdf, (page_image, _, _) = document
+    reducer = PDFReducer(ReductionOptions(grayscale=True))
+    placed_size = reducer._image_placements(pdf)[page_image.objgen]
+
+    params = reducer._read_image_params(page_image, _image_entries(page_image), placed_size)
+    # 400 pixels across 200pt (2.78in)
+    assert params[-1] == pytest.approx(400 / (200 / 72))
+
+
+def test_dpi_fallback_for_undrawn_image(document):
+    pdf, (_, _, unused_image) = document
+    reducer = PDFReducer(ReductionOptions(grayscale=True))
+    params = reducer._read_image_params(unused_image, _image_entries(unused_image), None)
+    assert params[-1] == pytest.approx(max(500, 250) / 10)
@@ -0,0 +1,99 @@
+"""Tests for JPEG quantization table helpers."""
+
+import io
+import struct
+
+import pytest
+from PIL import Image
+
+from pdfreducer.core.options import ReductionOptions
+from pdfreducer.core.qtables import STD_LUMA, ZIGZAG, estimate_jpeg_quality, scale_qtable
+from pdfreducer.core.reducer import _jpeg_needs_reencode
+
+
+def encode(quality: int, size=(64, 64), mode="RGB") -> bytes:
+    buffer = io.BytesIO()
+    Image.linear_gradient("L").resize(size).convert(mode).save(buffer, "JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def dqt_offset(data: bytes) -> int:
+    return data.index(b"\xff\xdb")
+
+
+@pytest.mark.parametrize("quality", [1, 5, 10, 25, 50, 75, 85, 95, 100])
+def test_estimate_quality_round_trip(quality):
+    assert estimate_jpeg_quality(encode(quality)) == pytest.approx(quality, abs=1)
+
+
+def test_estimate_quality_grayscale():
+    assert estimate_jpeg_quality(encode(60, mode="L")) == pytest.approx(60, abs=1)
+
+
+@pytest.mark.parametrize("quality", [1, 30, 50, 80, 100])
+def test_scale_qtable_matches_pillow(quality):
+    image = Image.open(io.BytesIO(encode(quality)))
+    assert list(image.quantization[0]) == scale_qtable(STD_LUMA, quality)
+
+
+def test_scale_qtable_clamps_to_baseline_range():
+    assert max(scale_qtable(STD_LUMA, 1)) == 255
+    assert min(scale_qtable(STD_LUMA, 100)) == 1
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"not a jpeg",
+        b"\xff\xd8",
+        b"\xff\xd8\x00\x00\x00\x00",
+        b"\xff\xd8\xff\xdb\x00\x02",
+        b"\xff\xd8\xff\xda\x00\x02",
+        # Claims a 16-bit table but holds only 8-bit data
+        b"\xff\xd8\xff\xdb\x00\x43\x10" + bytes(64),
+        # Invalid precision nibble
+        b"\xff\xd8\xff\xdb\x00\x43\x20" + bytes(64),
+    ],
+)
+def test_estimate_quality_malformed_returns_none(data):
+    assert estimate_jpeg_quality(data) is None
+
+
+@pytest.mark.parametrize("extra", [1, 4, 20, 64])
+def test_estimate_quality_truncated_returns_none(extra):
+    data = encode(70)
+    assert estimate_jpeg_quality(data[: dqt_offset(data) + extra]) is None
+
+
+def test_estimate_quality_16bit_table():
+    # DQT tables are stored in zigzag order
+    values = [STD_LUMA[index] for index in ZIGZAG]
+    data = b"\xff\xd8\xff\xdb" + struct.pack(">H", 2 + 1 + 128) + b"\x10" + struct.pack(">64H", *values)
+    assert estimate_jpeg_quality(data) == 50
+
+
+def test_needs_reencode_when_downsampling():
+    data = encode(50, size=(600, 600))
+    assert _jpeg_needs_reencode(data, 600, 600, "/DeviceRGB", 300, ReductionOptions(dpi=150))
+
+
+def test_needs_reencode_for_grayscale_conversion():
+    data = encode(50, size=(600, 600))
+    options = ReductionOptions(dpi=150, grayscale=True)
+    assert _jpeg_needs_reencode(data, 600, 600, "/DeviceRGB", 100, options)
+    assert not _jpeg_needs_reencode(data, 600, 600, "/DeviceGray", 100, options)
+
+
+def test_skips_jpeg_already_at_target_quality():
+    data = encode(80, size=(600, 600))
+    assert not _jpeg_needs_reencode(data, 600, 600, "/DeviceRGB", 100, ReductionOptions(quality=80))
+
+
+def test_reencodes_large_high_quality_jpeg():
+    # Noise keeps the file large, well above the compact threshold
+    image = Image.effect_noise((400, 400), 64).convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=100)
+    options = ReductionOptions(quality=60)
+    assert _jpeg_needs_reencode(buffer.getvalue(), 400, 400, "/DeviceRGB", 100, options)
@@ -0,0 +1,70 @@
+"""Tests for the web processing queue's Job serialization."""
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from pdfreducer.core.options import ReductionOptions
+from pdfreducer.web.queue import Job, JobStatus
+
+
+@pytest.fixture
+def job(tmp_path: Path) -> Job:
+    return Job(
+        id="job-1",
+        filename="scan.pdf",
+        input_path=tmp_path / "scan.pdf",
+        output_path=tmp_path / "scan_reduced.pdf",
+        options=ReductionOptions(),
+    )
+
+
+def test_to_dict_is_cached_until_change(job):
+    assert job.to_dict() is job.to_dict()
+    assert job.to_json() is job.to_json()
+
+
+def test_to_json_matches_to_dict(job):
+    assert json.loads(job.to_json()) == job.to_dict()
+
+
+@pytest.mark.parametrize(
+    "name, value, key, expected",
+    [
+        ("status", JobStatus.PROCESSING, "status", "processing"),
+        ("progress", 42.5, "progress", 42.5),
+        ("message", "Optimized image 1/3", "message", "Optimized image 1/3"),
+        ("completed_at", datetime(2024, 5, 1, 12, 30), "completed_at", "2024-05-01T12:30:00"),
+        ("reduced_size", 1234, "reduced_size", 1234),
+    ],
+)
+def test_serialized_forms_refresh_after_change(job, name, value, key, expected):
+    before_dict = job.to_dict()
+    before_json = job.to_json()
+
+    setattr(job, name, value)
+
+    assert job.to_dict() is not before_dict
+    assert job.to_dict()[key] == expected
+    assert json.loads(job.to_json())[key] == expected
+    assert job.to_json() != before_json
+
+
+def test_timestamps_serialized_as_iso(job):
+    assert job.to_dict()["created_at"] == job.created_at.isoformat()
+    assert job.to_dict()["completed_at"] is None
+
+    job.completed_at = None
+    assert job.to_dict()["completed_at"] is None
+
+
+def test_has_csv_refreshes_when_csv_dir_set(job, tmp_path):
+    assert job.to_dict()["has_csv"] is False
+
+    csv_dir = tmp_path / "tables"
+    csv_dir.mkdir()
+    job.csv_dir = csv_dir
+
+    assert job.to_dict()["has_csv"] is True